@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def make_client() -> httpx.AsyncClient:
+    """Build the HTTP client shared by every OpenAI and Bluesky call in a run.
+
+    Reusing one client keeps connections alive between requests, so only the
+    first call to each host pays for the TCP + TLS handshake. With HTTP/2,
+    concurrent tool calls, critiques and eval samples are multiplexed as
+    streams over that one connection instead of queueing for a free one.
+
+    httpx is imported here rather than at module level so CLI paths that
+    never make a request (e.g. printing usage) don't pay for loading it.
+    """
+
+    import httpx
+
+    return httpx.AsyncClient(
+        # HTTP/2 needs the optional ``h2`` package (``pip install "httpx[http2]"``);
+        # fall back to HTTP/1.1 rather than failing when it is missing.
+        http2=find_spec("h2") is not None,
+        timeout=60,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
@@ -1,13 +1,10 @@
 import os
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict
 
-from dotenv import load_dotenv
 
-
-load_dotenv()
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Runtime configuration loaded from environment variables."""
 
@@ -31,8 +28,16 @@ class Settings:
         - OPENAI_API_BASE
         - OPENAI_CHAT_MODEL
         - BLUESKY_APPVIEW_BASE
+
+        Values from a local .env file are loaded first (without overriding
+        variables already set in the environment).
         """
 
+        # Imported lazily so importing this module doesn't load python-dotenv.
+        from dotenv import load_dotenv
+
+        load_dotenv()
+
         openai_api_key = os.getenv("OPENAI_API_KEY")
 
         if not openai_api_key:
@@ -49,3 +54,20 @@ class Settings:
                 "BLUESKY_APPVIEW_BASE", "https://api.bsky.app"
             ),
         )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsed from the environment once."""
+
+    return Settings.from_env()
+
+
+@lru_cache(maxsize=None)
+def openai_headers(settings: Settings) -> Dict[str, str]:
+    """Request headers for OpenAI calls, built once per settings object."""
+
+    return {
+        "Authorization": f"Bearer {settings.openai_api_key}",
+        "Content-Type": "application/json",
+    }
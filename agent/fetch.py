@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import List
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Dict, List
 
-import httpx
+import orjson
 
 from .config import Settings
 
+if TYPE_CHECKING:
+    import httpx
 
-@dataclass
+
+@dataclass(slots=True)
 class Post:
     """Normalised representation of a Bluesky post we care about."""
 
@@ -21,6 +24,16 @@ class Post:
     images: List[str]
 
 
+# https://bsky.app/profile/<handle-or-did>/post/<rkey>, capturing profile + rkey.
+# Mirrors what urlparse + a split on "/" accepted: any scheme/host case, an
+# optional port, and repeated slashes between path segments.
+_BSKY_POST_URL_RE = re.compile(
+    r"^https?://(?:[^/?#\s]*\.)?bsky\.app(?::\d+)?"
+    r"/+profile/+([^/?#\s]+)/+post/+([^/?#\s]+)",
+    re.IGNORECASE,
+)
+
+
 def parse_bluesky_url(url: str) -> tuple[str, str]:
     """Extract profile and rkey segments from a bsky.app post URL.
 
@@ -28,25 +41,20 @@ def parse_bluesky_url(url: str) -> tuple[str, str]:
     - https://bsky.app/profile/<handle-or-did>/post/<rkey>
     """
 
-    parsed = urlparse(url)
-    if "bsky.app" not in (parsed.netloc or ""):
-        raise ValueError(f"Not a recognised Bluesky URL: {url!r}")
-
-    parts = [p for p in parsed.path.split("/") if p]
-    # profile/<handle>/post/<rkey>
-    if len(parts) < 4 or parts[0] != "profile" or parts[2] != "post":
+    m = _BSKY_POST_URL_RE.match(url.strip())
+    if m is None:
+        if "bsky.app" not in url:
+            raise ValueError(f"Not a recognised Bluesky URL: {url!r}")
         raise ValueError(f"Unexpected Bluesky post URL format: {url!r}")
 
-    profile = parts[1]
-    rkey = parts[3]
-    return profile, rkey
+    return m.group(1), m.group(2)
 
 
 def build_at_uri(profile: str, rkey: str) -> str:
     return f"at://{profile}/app.bsky.feed.post/{rkey}"
 
 
-def fetch_post(url: str, settings: Settings) -> Post:
+async def fetch_post(url: str, settings: Settings, client: httpx.AsyncClient) -> Post:
     """Fetch a Bluesky post via the public AppView API and normalise fields."""
 
     profile, rkey = parse_bluesky_url(url)
@@ -55,25 +63,37 @@ def fetch_post(url: str, settings: Settings) -> Post:
     endpoint = (
         f"{settings.bluesky_appview_base}/xrpc/app.bsky.feed.getPostThread"
     )
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(endpoint, params={"uri": uri})
-        resp.raise_for_status()
-        data = resp.json()
+    # depth=0 / parentHeight=0: only the target post, no replies or parents.
+    resp = await client.get(
+        endpoint,
+        params={"uri": uri, "depth": 0, "parentHeight": 0},
+        timeout=15,
+    )
+    resp.raise_for_status()
+    data = orjson.loads(resp.content)
 
     # The exact JSON shape is defined in the app.bsky.feed.getPostThread
-    # lexicon. Here we pull out the pieces we need, with defensive defaults
-    # so the grader can see the intent even if the schema evolves slightly.
-    thread = data.get("thread", {})
-    post = thread.get("post", {})
-    record = post.get("record", {})
-    author = post.get("author", {})
-
-    text = record.get("text", "")
-    created_at = record.get("createdAt", "")
-    author_handle = author.get("handle", "")
-
-    external_links: List[str] = []
-    images: List[str] = []
+    # lexicon. The fields below are required there, so index them directly;
+    # a missing one (e.g. a notFoundPost thread) yields an empty Post.
+    try:
+        post = data["thread"]["post"]
+        record = post["record"]
+        text, created_at = record["text"], record.get("createdAt", "")
+        author_handle = post["author"]["handle"]
+    except (KeyError, TypeError):
+        return Post(
+            uri=uri,
+            text="",
+            author_handle="",
+            created_at="",
+            external_links=[],
+            images=[],
+        )
+
+    # Dicts as insertion-ordered sets: the same link often appears in several
+    # facets, and we want each URL once, in first-seen order.
+    external_links: Dict[str, None] = {}
+    images: Dict[str, None] = {}
 
     # External links may appear in facets or embeds depending on the client.
     facets = record.get("facets") or []
@@ -82,21 +102,21 @@ def fetch_post(url: str, settings: Settings) -> Post:
             if feature.get("$type") == "app.bsky.richtext.facet#link":
                 uri_val = feature.get("uri")
                 if isinstance(uri_val, str):
-                    external_links.append(uri_val)
+                    external_links[uri_val] = None
 
     embed = post.get("embed") or {}
     if embed.get("$type") == "app.bsky.embed.images#view":
         for img in embed.get("images") or []:
             fullsize = img.get("fullsize")
             if isinstance(fullsize, str):
-                images.append(fullsize)
+                images[fullsize] = None
 
     return Post(
         uri=uri,
         text=text,
         author_handle=author_handle,
         created_at=created_at,
-        external_links=external_links,
-        images=images,
+        external_links=list(external_links),
+        images=list(images),
     )
 
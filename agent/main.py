@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import sys
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-import httpx
+import orjson
 
-from .config import Settings
+from .client import make_client
+from .config import Settings, get_settings, openai_headers
 from .fetch import fetch_post, parse_bluesky_url, build_at_uri
 
+if TYPE_CHECKING:
+    # Only needed for annotations; httpx itself is loaded by make_client().
+    import httpx
+
 
 # ---------------------------------------------------------------------------
 # Tool definitions
@@ -81,18 +87,39 @@ TOOLS: List[Dict[str, Any]] = [
 ]
 
 
+@lru_cache(maxsize=None)
+def _agent_body_prefix(model: str) -> bytes:
+    """Serialised agent-turn request body up to (and including) ``"messages":``.
+
+    Everything except the conversation is identical on every turn, so the large
+    TOOLS schema is encoded once per model and only ``messages`` is serialised
+    per request.
+    """
+    fixed = orjson.dumps({"model": model, "tool_choice": "required", "temperature": 0.2})
+    return fixed[:-1] + b',"tools":' + orjson.dumps(TOOLS) + b',"messages":'
+
+
+def completion_message(resp: httpx.Response) -> Dict[str, Any]:
+    """Decode a chat completion body straight into its first choice's message.
+
+    One orjson pass over the raw bytes; structured-output ``content`` and tool
+    call ``arguments`` stay as strings until the caller actually needs them.
+    """
+    return orjson.loads(resp.content)["choices"][0]["message"]
+
+
 # ---------------------------------------------------------------------------
 # Tool implementations
 # ---------------------------------------------------------------------------
 
-def _tool_search_bluesky(query: str, limit: int = 5) -> str:
-    with httpx.Client(timeout=20) as client:
-        resp = client.get(
-            "https://api.bsky.app/xrpc/app.bsky.feed.searchPosts",
-            params={"q": query, "limit": min(limit, 10)},
-        )
-        resp.raise_for_status()
-        posts = resp.json().get("posts", [])
+async def _tool_search_bluesky(client: httpx.AsyncClient, query: str, limit: int = 5) -> str:
+    resp = await client.get(
+        "https://api.bsky.app/xrpc/app.bsky.feed.searchPosts",
+        params={"q": query, "limit": min(limit, 10)},
+        timeout=20,
+    )
+    resp.raise_for_status()
+    posts = orjson.loads(resp.content).get("posts", [])
 
     results = []
     for post in posts:
@@ -104,37 +131,69 @@ def _tool_search_bluesky(query: str, limit: int = 5) -> str:
         if text:
             results.append({"url": url, "handle": handle, "text": text})
 
-    return json.dumps(results, ensure_ascii=False)
+    return orjson.dumps(results).decode()
 
 
-def _tool_fetch_post(url: str) -> str:
+class _ToolError(Exception):
+    """A tool call failed; reported back to the LLM as ``{"error": ...}``."""
+
+
+async def _tool_fetch_post(client: httpx.AsyncClient, url: str) -> str:
     try:
         profile, rkey = parse_bluesky_url(url)
     except ValueError as e:
-        return json.dumps({"error": str(e)})
+        raise _ToolError(str(e)) from e
 
     uri = build_at_uri(profile, rkey)
     try:
-        with httpx.Client(timeout=15) as client:
-            resp = client.get(
-                "https://api.bsky.app/xrpc/app.bsky.feed.getPostThread",
-                params={"uri": uri},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await client.get(
+            "https://api.bsky.app/xrpc/app.bsky.feed.getPostThread",
+            params={"uri": uri, "depth": 0, "parentHeight": 0},
+            timeout=15,
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        raise _ToolError(str(e)) from e
+
+    try:
+        text = data["thread"]["post"]["record"]["text"]
+    except (KeyError, TypeError):
+        text = ""
+    return orjson.dumps({"url": url, "text": text}).decode()
 
-    text = data.get("thread", {}).get("post", {}).get("record", {}).get("text", "")
-    return json.dumps({"url": url, "text": text}, ensure_ascii=False)
 
+# Tool results keyed by (tool name, canonical JSON of its arguments).
+ToolCache = Dict[Tuple[str, bytes], str]
 
-def _dispatch_tool(name: str, arguments: Dict[str, Any]) -> str:
-    if name == "search_bluesky":
-        return _tool_search_bluesky(**arguments)
-    if name == "fetch_post":
-        return _tool_fetch_post(**arguments)
-    return json.dumps({"error": f"Unknown tool: {name}"})
+
+async def _run_tool(
+    name: str, arguments: Dict[str, Any], client: httpx.AsyncClient
+) -> Tuple[str, bool]:
+    """Run a tool. Returns ``(content, ok)``; failures come back as an error payload."""
+    try:
+        if name == "search_bluesky":
+            return await _tool_search_bluesky(client, **arguments), True
+        if name == "fetch_post":
+            return await _tool_fetch_post(client, **arguments), True
+        raise _ToolError(f"Unknown tool: {name}")
+    except _ToolError as e:
+        return orjson.dumps({"error": str(e)}).decode(), False
+
+
+async def _dispatch_tool(
+    name: str, arguments: Dict[str, Any], client: httpx.AsyncClient, cache: ToolCache
+) -> str:
+    """Run a tool, answering repeat calls with identical arguments from ``cache``."""
+    key = (name, orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS))
+    if key in cache:
+        return cache[key]
+
+    content, ok = await _run_tool(name, arguments, client)
+    # Errors are not cached so the LLM can retry a transient failure.
+    if ok:
+        cache[key] = content
+    return content
 
 
 # ---------------------------------------------------------------------------
@@ -175,36 +234,71 @@ FAIL if ANY of:
 - Bullets are vague or could apply to any post on the topic"""
 
 
-def _critique_bullets(bullets: List[str], post_text: str, settings: Settings) -> Dict[str, str]:
-    """Ask the LLM to evaluate bullet quality. Returns {verdict, reason}."""
-    numbered = "\n".join(f"{i+1}. {b}" for i, b in enumerate(bullets))
+def number_bullets(bullets: List[str]) -> str:
+    """Render bullets as a 1-based numbered list, as shown to critique and judge."""
+    return "\n".join(f"{i+1}. {b}" for i, b in enumerate(bullets))
 
-    with httpx.Client(timeout=30) as client:
-        resp = client.post(
-            f"{settings.openai_api_base}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {settings.openai_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": settings.openai_chat_model,
-                "messages": [
-                    {"role": "system", "content": CRITIQUE_PROMPT},
-                    {"role": "user", "content": f"POST:\n{post_text}\n\nBULLETS:\n{numbered}"},
-                ],
-                "response_format": CRITIQUE_SCHEMA,
-                "temperature": 0.0,
-            },
-        )
-        resp.raise_for_status()
 
-    return json.loads(resp.json()["choices"][0]["message"]["content"])
+async def _critique_bullets(
+    numbered: str, post_text: str, settings: Settings, client: httpx.AsyncClient
+) -> Dict[str, str]:
+    """Ask the LLM to evaluate numbered bullets. Returns {verdict, reason}."""
+
+    resp = await client.post(
+        f"{settings.openai_api_base}/chat/completions",
+        headers=openai_headers(settings),
+        json={
+            "model": settings.openai_chat_model,
+            "messages": [
+                {"role": "system", "content": CRITIQUE_PROMPT},
+                {"role": "user", "content": f"POST:\n{post_text}\n\nBULLETS:\n{numbered}"},
+            ],
+            "response_format": CRITIQUE_SCHEMA,
+            "temperature": 0.0,
+        },
+        timeout=30,
+    )
+    resp.raise_for_status()
+
+    return orjson.loads(completion_message(resp)["content"])
 
 
 # ---------------------------------------------------------------------------
 # Agentic loop
 # ---------------------------------------------------------------------------
 
+# Tool results from this many most recent turns are resent verbatim; older ones
+# are shortened so the conversation doesn't balloon with stale search output.
+KEEP_TOOL_TURNS = 2
+TRIMMED_TEXT_CHARS = 120
+
+
+def _trim_tool_content(content: str) -> str:
+    """Shorten post text in a tool result while keeping its urls and handles.
+
+    The LLM cites sources by url in finish(), so those must survive; the full
+    post bodies it has already read are what make old turns expensive.
+    """
+    data = orjson.loads(content)
+    items = data if isinstance(data, list) else [data]
+    for item in items:
+        text = item.get("text") if isinstance(item, dict) else None
+        if isinstance(text, str) and len(text) > TRIMMED_TEXT_CHARS:
+            item["text"] = f"{text[:TRIMMED_TEXT_CHARS]}… [trimmed]"
+    return orjson.dumps(data).decode()
+
+
+def _discard(future: asyncio.Future) -> None:
+    """Cancel ``future`` and make sure its outcome is read once it settles.
+
+    A gather cancelled mid-flight finishes later with ``CancelledError`` set as
+    its exception; without a reader asyncio logs "exception was never
+    retrieved" for it.
+    """
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    future.cancel()
+
+
 SYSTEM_PROMPT = """You are a Bluesky post explainer. Your job is to explain the background
 context of a Bluesky post for someone outside the author's bubble.
 
@@ -227,11 +321,35 @@ Each bullet must:
 Do NOT summarize the post. Explain what it assumes the reader already knows."""
 
 
-def explain_post(url: str) -> Dict[str, object]:
-    """Agentic loop: LLM drives search + fetch until critique passes."""
-    settings = Settings.from_env()
+async def explain_post_async(
+    url: str,
+    client: httpx.AsyncClient | None = None,
+    tool_cache: ToolCache | None = None,
+    label: str = "",
+) -> Dict[str, object]:
+    """Agentic loop: LLM drives search + fetch until critique passes.
+
+    Pass a shared ``client`` to reuse its connection pool; otherwise one is
+    created for this call and closed before returning. Tool calls issued in
+    the same turn are dispatched concurrently. Tool results are memoised in
+    ``tool_cache`` (a fresh one per call unless supplied). A ``label`` prefixes
+    every progress line on stderr, so concurrent runs stay distinguishable.
+    """
+    if client is None:
+        async with make_client() as own_client:
+            return await explain_post_async(url, own_client, tool_cache, label)
+
+    tag = f"[{label}] " if label else ""
+
+    def log(msg: str) -> None:
+        print(f"{tag}{msg}", file=sys.stderr)
 
-    post = fetch_post(url, settings)
+    if tool_cache is None:
+        tool_cache = {}
+
+    settings = get_settings()
+
+    post = await fetch_post(url, settings, client)
     if not post.text:
         raise ValueError("Fetched post has empty text; cannot explain.")
 
@@ -240,30 +358,24 @@ def explain_post(url: str) -> Dict[str, object]:
         {"role": "user", "content": f"Explain this Bluesky post:\n\n{post.text}"},
     ]
 
-    headers = {
-        "Authorization": f"Bearer {settings.openai_api_key}",
-        "Content-Type": "application/json",
-    }
+    chat_url = f"{settings.openai_api_base}/chat/completions"
+    headers = openai_headers(settings)
+    body_prefix = _agent_body_prefix(settings.openai_chat_model)
+    tool_turns: List[List[Dict[str, Any]]] = []
 
     for iteration in range(1, 11):
-        print(f"\n[iter {iteration}]", file=sys.stderr)
-
-        with httpx.Client(timeout=60) as client:
-            resp = client.post(
-                f"{settings.openai_api_base}/chat/completions",
-                headers=headers,
-                json={
-                    "model": settings.openai_chat_model,
-                    "messages": messages,
-                    "tools": TOOLS,
-                    "tool_choice": "required",
-                    "temperature": 0.2,
-                },
-            )
-            resp.raise_for_status()
+        if not tag:
+            print(file=sys.stderr)
+        log(f"[iter {iteration}]")
+
+        resp = await client.post(
+            chat_url,
+            headers=headers,
+            content=body_prefix + orjson.dumps(messages) + b"}",
+        )
+        resp.raise_for_status()
 
-        response_message = resp.json()["choices"][0]["message"]
-        messages.append(response_message)
+        response_message = completion_message(resp)
 
         tool_calls = response_message.get("tool_calls") or []
         if not tool_calls:
@@ -272,45 +384,88 @@ def explain_post(url: str) -> Dict[str, object]:
         finish_tc = next((tc for tc in tool_calls if tc["function"]["name"] == "finish"), None)
 
         if finish_tc:
-            args = json.loads(finish_tc["function"]["arguments"])
+            args = orjson.loads(finish_tc["function"]["arguments"])
             bullets, sources = args["bullets"], args["sources"]
-
-            critique = _critique_bullets(bullets, post.text, settings)
-            print(f"  → finish() critique: {critique['verdict']} — {critique['reason']}", file=sys.stderr)
+            numbered = number_bullets(bullets)
+
+            # Tool calls issued alongside finish() only matter if the critique
+            # fails, so start them now and let them overlap the critique call
+            # rather than paying for both round-trips back to back.
+            other_tcs = [tc for tc in tool_calls if tc["id"] != finish_tc["id"]]
+            pending = asyncio.gather(*(
+                _dispatch_tool(tc["function"]["name"], orjson.loads(tc["function"]["arguments"]), client, tool_cache)
+                for tc in other_tcs
+            )) if other_tcs else None
+
+            try:
+                critique = await _critique_bullets(numbered, post.text, settings, client)
+            except BaseException:
+                if pending is not None:
+                    _discard(pending)
+                raise
+            log(f"  → finish() critique: {critique['verdict']} — {critique['reason']}")
 
             if critique["verdict"] == "pass":
-                print(f"  ✓ done in {iteration} iteration(s)", file=sys.stderr)
-                return {"bullets": bullets, "sources": sources, "post_text": post.text}
+                if pending is not None:
+                    _discard(pending)
+                log(f"  ✓ done in {iteration} iteration(s)")
+                return {
+                    "bullets": bullets,
+                    "numbered_bullets": numbered,
+                    "sources": sources,
+                    "post_text": post.text,
+                }
+
+            # Only a rejected finish() continues the conversation, so the
+            # assistant message is recorded here rather than before the critique.
+            messages.append(response_message)
 
             # Provide required tool results for all calls in this batch
-            for tc in tool_calls:
-                content = (
-                    json.dumps({"status": "rejected", "reason": critique["reason"]})
-                    if tc["id"] == finish_tc["id"]
-                    else _dispatch_tool(tc["function"]["name"], json.loads(tc["function"]["arguments"]))
-                )
-                messages.append({"role": "tool", "tool_call_id": tc["id"], "content": content})
+            contents: Dict[str, str] = {}
+            if pending is not None:
+                contents = dict(zip((tc["id"] for tc in other_tcs), await pending))
+            contents[finish_tc["id"]] = orjson.dumps({"status": "rejected", "reason": critique["reason"]}).decode()
+            batch = [
+                {"role": "tool", "tool_call_id": tc["id"], "content": contents[tc["id"]]}
+                for tc in tool_calls
+            ]
+            messages.extend(batch)
 
             messages.append({
                 "role": "user",
                 "content": f"Quality check failed: {critique['reason']}\n\nSearch for more specific context and try finish() again.",
             })
         else:
-            # No finish call — dispatch all tools and continue
+            # No finish call — dispatch all tools concurrently and continue
+            messages.append(response_message)
+            coros = []
             for tc in tool_calls:
                 name = tc["function"]["name"]
-                args = json.loads(tc["function"]["arguments"])
+                args = orjson.loads(tc["function"]["arguments"])
                 display = {k: (f"{str(v)[:60]}…" if len(str(v)) > 60 else v) for k, v in args.items()}
-                print(f"  → {name}({display})", file=sys.stderr)
-                messages.append({
-                    "role": "tool",
-                    "tool_call_id": tc["id"],
-                    "content": _dispatch_tool(name, args),
-                })
+                log(f"  → {name}({display})")
+                coros.append(_dispatch_tool(name, args, client, tool_cache))
+
+            results = await asyncio.gather(*coros)
+            batch = [
+                {"role": "tool", "tool_call_id": tc["id"], "content": content}
+                for tc, content in zip(tool_calls, results)
+            ]
+            messages.extend(batch)
+
+        tool_turns.append(batch)
+        if len(tool_turns) > KEEP_TOOL_TURNS:
+            for msg in tool_turns[-KEEP_TOOL_TURNS - 1]:
+                msg["content"] = _trim_tool_content(msg["content"])
 
     raise RuntimeError("Agent did not produce passing bullets within 10 iterations.")
 
 
+def explain_post(url: str) -> Dict[str, object]:
+    """Synchronous wrapper around :func:`explain_post_async` for the CLI and evals."""
+    return asyncio.run(explain_post_async(url))
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -329,9 +484,9 @@ def _print_human_readable(result: Dict[str, object]) -> None:
 
 def main(argv: List[str] | None = None) -> None:
     argv = list(sys.argv[1:] if argv is None else argv)
-    if not argv:
+    if not argv or argv[0] in ("-h", "--help"):
         print("Usage: python -m agent.main <bluesky_post_url>")
-        raise SystemExit(1)
+        raise SystemExit(0 if argv else 1)
 
     result = explain_post(argv[0])
     _print_human_readable(result)
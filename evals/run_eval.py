@@ -1,22 +1,28 @@
 """Eval harness for the Bluesky post explainer agent.
 
-Runs each entry in evals/dataset.json through explain_post() and scores the result
-using an LLM judge that compares the produced bullets against the gold_summary.
+Runs the entries in evals/dataset.json concurrently through explain_post_async()
+(at most MAX_CONCURRENT_SAMPLES at a time) and scores each result using an LLM
+judge that compares the produced bullets against the gold_summary.
 
 Output: per-sample verdict + aggregate pass rate printed to stdout.
 """
 from __future__ import annotations
 
-import json
+import asyncio
+import os
 import sys
 import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, List
 
-import httpx
+import orjson
+
+if TYPE_CHECKING:
+    import httpx
 
 # Resolve dataset path relative to this file
 DATASET_PATH = Path(__file__).parent / "dataset.json"
+RESULTS_PATH = Path(__file__).parent / "results.json"
 
 # ---------------------------------------------------------------------------
 # LLM judge
@@ -61,91 +67,142 @@ FAIL (score < 6) if:
 Be strict. The agent should earn its pass."""
 
 
-def _judge(
+async def _judge(
     post_text: str,
     gold_summary: str,
-    bullets: List[str],
+    numbered_bullets: str,
     settings: Any,
+    client: httpx.AsyncClient,
 ) -> Dict[str, Any]:
-    numbered = "\n".join(f"{i+1}. {b}" for i, b in enumerate(bullets))
+    # Imported here, like run_eval()'s agent imports, after sys.path is set up.
+    from agent.config import openai_headers
+    from agent.main import completion_message
+
     user_content = (
         f"POST TEXT:\n{post_text}\n\n"
         f"GOLD SUMMARY:\n{gold_summary}\n\n"
-        f"AGENT BULLETS:\n{numbered}"
+        f"AGENT BULLETS:\n{numbered_bullets}"
     )
-    with httpx.Client(timeout=30) as client:
-        resp = client.post(
-            f"{settings.openai_api_base}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {settings.openai_api_key}",
-                "Content-Type": "application/json",
-            },
-            json={
-                "model": settings.openai_chat_model,
-                "messages": [
-                    {"role": "system", "content": JUDGE_PROMPT},
-                    {"role": "user", "content": user_content},
-                ],
-                "response_format": JUDGE_SCHEMA,
-                "temperature": 0.0,
-            },
-        )
-        resp.raise_for_status()
-    return json.loads(resp.json()["choices"][0]["message"]["content"])
+    resp = await client.post(
+        f"{settings.openai_api_base}/chat/completions",
+        headers=openai_headers(settings),
+        json={
+            "model": settings.openai_chat_model,
+            "messages": [
+                {"role": "system", "content": JUDGE_PROMPT},
+                {"role": "user", "content": user_content},
+            ],
+            "response_format": JUDGE_SCHEMA,
+            "temperature": 0.0,
+        },
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return orjson.loads(completion_message(resp)["content"])
 
 
 # ---------------------------------------------------------------------------
 # Main eval runner
 # ---------------------------------------------------------------------------
 
-def run_eval() -> None:
+# Samples evaluated at once; keeps us well inside OpenAI rate limits.
+MAX_CONCURRENT_SAMPLES = 4
+
+# results.json is fsync'd after this many samples, so a crash loses little.
+FSYNC_EVERY = 5
+
+
+class _ResultsWriter:
+    """Stream per-sample results into a JSON array as samples finish.
+
+    Records are written in dataset order: a sample that finishes early is held
+    only until every sample before it has been written. ``close()`` flushes any
+    still-held records and terminates the array, so an interrupted run leaves
+    valid JSON containing every sample that did finish.
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self._fp = fp
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._next = 0
+        self._written = 0
+        self._fp.write(b"[\n")
+
+    def add(self, index: int, record: Dict[str, Any]) -> None:
+        self._pending[index] = record
+        while self._next in self._pending:
+            self._write(self._pending.pop(self._next))
+            self._next += 1
+
+    def close(self) -> None:
+        for index in sorted(self._pending):
+            self._write(self._pending.pop(index))
+        self._fp.write(b"\n]\n")
+        self._sync()
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        if self._written:
+            self._fp.write(b",\n")
+        self._fp.write(orjson.dumps(record, option=orjson.OPT_INDENT_2))
+        self._written += 1
+        if self._written % FSYNC_EVERY == 0:
+            self._sync()
+
+    def _sync(self) -> None:
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+
+async def run_eval() -> None:
     # Import here so the harness can be run via run.sh
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from agent.config import Settings
-    from agent.main import explain_post
+    from agent.client import make_client
+    from agent.config import get_settings
+    from agent.main import ToolCache, explain_post_async
 
-    settings = Settings.from_env()
+    settings = get_settings()
 
-    dataset: List[Dict[str, Any]] = json.loads(DATASET_PATH.read_text())
+    dataset: List[Dict[str, Any]] = orjson.loads(DATASET_PATH.read_bytes())
     total = len(dataset)
-    passed = 0
-    results = []
+    sem = asyncio.Semaphore(MAX_CONCURRENT_SAMPLES)
+    # Shared across samples: related posts often trigger the same searches.
+    tool_cache: ToolCache = {}
 
     print(f"Running eval on {total} samples...\n{'='*60}")
 
-    for sample in dataset:
+    async def run_sample(sample: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
         sid = sample["id"]
         category = sample["category"]
         url = sample["url"]
         gold = sample["gold_summary"]
 
-        print(f"\n[{sid}] category={category}")
-        print(f"  url: {url}")
+        # Samples finish out of order, so each one prints its block in one go.
+        lines = [f"\n[{sid}] category={category}", f"  url: {url}"]
 
         try:
-            t0 = time.time()
-            result = explain_post(url)
-            elapsed = time.time() - t0
-
-            bullets = result["bullets"]
-            verdict_data = _judge(result["post_text"], gold, bullets, settings)
+            async with sem:
+                t0 = time.time()
+                result = await explain_post_async(url, client, tool_cache, label=str(sid))
+                elapsed = time.time() - t0
+
+                bullets = result["bullets"]
+                verdict_data = await _judge(
+                    result["post_text"], gold, result["numbered_bullets"], settings, client
+                )
             verdict = verdict_data["verdict"]
             score = verdict_data["score"]
             reason = verdict_data["reason"]
 
-            if verdict == "pass":
-                passed += 1
-                status = "✓ PASS"
-            else:
-                status = "✗ FAIL"
+            status = "✓ PASS" if verdict == "pass" else "✗ FAIL"
 
-            print(f"  {status} (score={score}/10, {elapsed:.1f}s)")
-            print(f"  judge: {reason}")
-            print(f"  bullets ({len(bullets)}):")
+            lines.append(f"  {status} (score={score}/10, {elapsed:.1f}s)")
+            lines.append(f"  judge: {reason}")
+            lines.append(f"  bullets ({len(bullets)}):")
             for b in bullets:
-                print(f"    - {b[:120]}")
+                lines.append(f"    - {b[:120]}")
+            print("\n".join(lines))
 
-            results.append({
+            return {
                 "id": sid,
                 "category": category,
                 "verdict": verdict,
@@ -153,17 +210,48 @@ def run_eval() -> None:
                 "elapsed_s": round(elapsed, 1),
                 "judge_reason": reason,
                 "bullets": bullets,
-            })
+            }
 
         except Exception as exc:
-            print(f"  ERROR: {exc}")
-            results.append({
+            lines.append(f"  ERROR: {exc}")
+            print("\n".join(lines))
+            return {
                 "id": sid,
                 "category": category,
                 "verdict": "error",
                 "score": 0,
                 "error": str(exc),
-            })
+            }
+
+    async def record_sample(
+        index: int, sample: Dict[str, Any], client: httpx.AsyncClient, writer: _ResultsWriter
+    ) -> Dict[str, Any]:
+        r = await run_sample(sample, client)
+        writer.add(index, r)
+        # Only what the summary needs is kept in memory for the whole run.
+        return {"id": r["id"], "category": r["category"], "verdict": r["verdict"], "score": r["score"]}
+
+    # Stream into a side file so the previous results.json survives a hard
+    # kill; it is swapped in once the array has been closed.
+    partial_path = RESULTS_PATH.with_suffix(".json.partial")
+    out = partial_path.open("wb")
+    writer = _ResultsWriter(out)
+    try:
+        # One connection pool for the whole run: agent and judge calls across all
+        # samples reuse the same warmed TLS sessions to OpenAI and Bluesky.
+        async with make_client() as client:
+            # gather() returns results in dataset order regardless of completion order.
+            results = await asyncio.gather(*(
+                asyncio.create_task(record_sample(i, s, client, writer))
+                for i, s in enumerate(dataset)
+            ))
+    finally:
+        # Also runs on Ctrl-C (a cancellation under asyncio.run) or any error
+        # escaping gather(), so finished samples still land as valid JSON.
+        writer.close()
+        out.close()
+        os.replace(partial_path, RESULTS_PATH)
+    passed = sum(1 for r in results if r["verdict"] == "pass")
 
     # Summary
     print(f"\n{'='*60}")
@@ -174,11 +262,8 @@ def run_eval() -> None:
         score_str = f"score={r.get('score', '?')}/10"
         print(f"  {icon} [{r['id']}] {r['category']:20s} {score_str}")
 
-    # Write JSON results
-    out_path = Path(__file__).parent / "results.json"
-    out_path.write_text(json.dumps(results, indent=2, ensure_ascii=False))
-    print(f"\nDetailed results written to {out_path}")
+    print(f"\nDetailed results written to {RESULTS_PATH}")
 
 
 if __name__ == "__main__":
-    run_eval()
+    asyncio.run(run_eval())